@@ -16,3 +16,11 @@ class Diagnostic(models.Model):
     patient = fields.ForeignKeyField('models.Patient', related_name='diagnostics')
     genre = fields.CharField(max_length=100)
     responses = fields.JSONField()
+
+class QuestionnaireSession(models.Model):
+    id = fields.IntField(pk=True)
+    patient = fields.ForeignKeyField('models.Patient', related_name='sessions')
+    genre = fields.CharField(max_length=100)
+    responses = fields.JSONField(default=dict)
+    domain_scores = fields.JSONField(default=dict)
+    finished = fields.BooleanField(default=False)
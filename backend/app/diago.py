@@ -1,20 +1,9 @@
-from openai import OpenAI
 import json
 from io import StringIO
-from dotenv import load_dotenv
-import os
-
-# Charger les variables d'environnement à partir du fichier .env
-load_dotenv()
-
-# Récupérer les variables d'environnement
-openai_api_key = os.getenv('OPENAI_API_KEY')
-openai_base_url = os.getenv('OPENAI_BASE_URL')
-
-client = OpenAI(
-    base_url = openai_base_url,
-    api_key = openai_api_key
-)
+from concurrent.futures import ThreadPoolExecutor
+import time
+from threading import Event, Lock
+from llm import get_client
 
 def dictDataExtract(file):
     result = "Patient name: " + file['patient_name'] + ", gender: " + file['patient_gender'] + "\n"
@@ -26,7 +15,7 @@ def dictDataExtract(file):
 def mistral_summup(score, file, language):
     prompt = dictDataExtract(file)
     doc = "Interpreting the Kansas City Cardiomyopathy Questionnaire in Clinical Trials and Clinical Care by John A. Spertus et al."
-    response = client.chat.completions.create(
+    response = get_client().chat.completions.create(
         model="mistral-nemo-instruct-2407",
         messages = [
             { "role": "system", "content": "This data is compose of " + prompt + ". Use only the data and the score given by the users, be neutral. Give exactly the answers to the question but in " + language + ". Try to structure correctly the answer."},
@@ -40,15 +29,63 @@ def mistral_summup(score, file, language):
     )
     return (response)
 
-def interview_summup(score, file):
+def interview_summup(score, file, stop=None):
     language = "french"
     result = StringIO()
     response = mistral_summup(score, file, language)
     for chunk in response:
+        # Résumé devenu inutile (réponses modifiées) : on libère le worker
+        if stop is not None and stop.is_set():
+            response.close()
+            break
         if chunk.choices and chunk.choices[-1].delta.content:
             result.write(chunk.choices[-1].delta.content)
     return result.getvalue()
 
+# Résumés générés à l'avance : clé de session -> (empreinte des réponses, Future, Event d'arrêt, date)
+_executor = ThreadPoolExecutor(max_workers=2)
+_speculative = {}
+_speculative_lock = Lock()
+SPECULATIVE_TTL = 15 * 60  # Secondes avant d'oublier un résumé jamais récupéré
+
+def _fingerprint(score, file):
+    return json.dumps({"score": score, "file": file}, sort_keys=True, default=str)
+
+def _discard(entry):
+    # Annule le résumé s'il n'a pas démarré, l'interrompt sinon
+    _, future, stop, _ = entry
+    stop.set()
+    future.cancel()
+
+def _evict_expired(now):
+    for key, entry in list(_speculative.items()):
+        if now - entry[3] > SPECULATIVE_TTL:
+            _discard(_speculative.pop(key))
+
+def speculate_summup(key, score, file):
+    """Lance la génération du résumé en tâche de fond, réutilisée si les réponses n'ont pas changé."""
+    fingerprint = _fingerprint(score, file)
+    now = time.monotonic()
+    with _speculative_lock:
+        _evict_expired(now)
+        current = _speculative.pop(key, None)
+        if current is not None:
+            future = current[1]
+            # Mêmes réponses et pas d'échec : on réutilise
+            if current[0] == fingerprint and (not future.done() or future.exception() is None):
+                _speculative[key] = current
+                return future
+            _discard(current)
+        stop = Event()
+        future = _executor.submit(interview_summup, score, file, stop)
+        _speculative[key] = (fingerprint, future, stop, now)
+    return future
+
+def release_summup(key):
+    """Oublie le résumé d'une session dont le diagnostic est enregistré."""
+    with _speculative_lock:
+        _speculative.pop(key, None)
+
 """test = {
     "patient_name": "Louis Martin",
     "patient_gender": "male",
@@ -1,15 +1,12 @@
-from openai import OpenAI
 import json
 from io import StringIO
 import logging
-
-client = OpenAI(
-    base_url = "https://api.scaleway.ai/c98de2b2-feb7-4780-a578-4c5276194bf4/v1",
-	api_key = "a1a533f0-283e-4977-b763-2759d25e1f7f"
-)
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from llm import get_client
 
 def askQuestion(question, language, gender):
-    response = client.chat.completions.create(
+    response = get_client().chat.completions.create(
         model="mistral-nemo-instruct-2407",
         messages=[
             { "role": "system", "content": "You are an AI assistant. You will ask me back the question I am giving to you." + "Ask it in " + language + ". You are talking to a " + gender +", keep it medical and neutral."},
@@ -31,7 +28,38 @@ def receiveQuestion(response):
     return output.getvalue()
 
 def take_question(file):
+    # Copie : la liste globale des questions sert de clé au cache des reformulations
+    file = [dict(question) for question in file]
     for question in file:
         tmp = askQuestion(question['text'], "english", "female")
         question['text'] =  receiveQuestion(tmp)
     return (file)
+
+QUESTION_LANGUAGE = "english"
+PREFETCH_AHEAD = 2  # Nombre de questions reformulées à l'avance
+
+# Cache des reformulations : (question, langue, genre) -> Future
+# Permet de préparer les questions suivantes pendant que le patient répond.
+_executor = ThreadPoolExecutor(max_workers=4)
+_rephrased = {}
+_rephrased_lock = Lock()
+
+def _rephrase(question, language, gender):
+    return receiveQuestion(askQuestion(question, language, gender))
+
+def prefetch_question(question, language, gender):
+    key = (question, language, gender)
+    with _rephrased_lock:
+        future = _rephrased.get(key)
+        # On relance si l'appel précédent a échoué
+        if future is None or (future.done() and future.exception() is not None):
+            future = _executor.submit(_rephrase, question, language, gender)
+            _rephrased[key] = future
+    return future
+
+def cached_question(question, language, gender):
+    # Texte déjà reformulé, sans attendre ni appeler le LLM
+    future = _rephrased.get((question, language, gender))
+    if future is not None and future.done() and not future.cancelled() and future.exception() is None:
+        return future.result()
+    return None
@@ -36,6 +36,17 @@ class DiagnosticData(BaseModel):
     responses: Dict[int, str] = Field(..., example={1: "coucou", 2:"salam", 3:"jemappellebizarre", 4:"jaiunprobleme", 5:"jeprendsdutemps"})
 
 
+class SessionStartRequest(BaseModel):
+    patient_name: str = Field(..., example="Felou")
+    patient_gender: int = Field(..., example=1)
+
+
+class SessionAnswerRequest(BaseModel):
+    question_id: int = Field(..., example=1)
+    response: int = Field(..., example=3)
+    text: Optional[str] = Field(None, example="How much are you limited when showering?")  # Texte affiché au patient
+
+
 class DiagnosticResponse(BaseModel):
     id: int
     genre: int
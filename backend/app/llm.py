@@ -0,0 +1,21 @@
+from functools import lru_cache
+from dotenv import load_dotenv
+import os
+
+# Charger les variables d'environnement à partir du fichier .env
+load_dotenv()
+
+
+@lru_cache(maxsize=None)
+def get_client():
+    # Import et création différés : le client OpenAI (et son pool HTTP)
+    # n'est construit qu'au premier appel, pas au démarrage
+    from openai import OpenAI
+
+    openai_api_key = os.getenv('OPENAI_API_KEY')
+    if not openai_api_key:
+        raise RuntimeError("OPENAI_API_KEY is not set")
+    return OpenAI(
+        base_url = os.getenv('OPENAI_BASE_URL'),
+        api_key = openai_api_key
+    )
@@ -1,21 +1,25 @@
+import time
+boot_time = time.perf_counter()
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from routes import router
-import os
-from tortoise.contrib.fastapi import register_tortoise
-
-app = FastAPI()
+from settings import TORTOISE_ORM
+from tortoise.contrib.fastapi import RegisterTortoise
+import startup
 
 
 DATABASE_URL = "postgres://user:password@db:5432/mydatabase"
 
-register_tortoise(
-    app,
-    db_url=os.environ.get('DATABASE_URL'),
-    modules={'models': ['db_models']},
-    generate_schemas=True,
-    add_exception_handlers=True,
-)
+
+# Plus de generate_schemas à chaque démarrage : vérification rapide de la version (voir startup.py)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with RegisterTortoise(app, config=TORTOISE_ORM, add_exception_handlers=True):
+        await startup.on_startup(boot_time)
+        yield
+
+app = FastAPI(lifespan=lifespan)
 
 # Inclure le router des routes
 app.include_router(router)
@@ -0,0 +1,64 @@
+from tortoise import BaseDBAsyncClient
+
+RUN_IN_TRANSACTION = True
+
+
+async def upgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        CREATE TABLE IF NOT EXISTS "docteur" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "nom" VARCHAR(100) NOT NULL
+);
+CREATE TABLE IF NOT EXISTS "patient" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "nom" VARCHAR(100) NOT NULL
+);
+CREATE TABLE IF NOT EXISTS "diagnostic" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "contenu" JSONB NOT NULL,
+    "questions" JSONB NOT NULL,
+    "genre" VARCHAR(100) NOT NULL,
+    "responses" JSONB NOT NULL,
+    "patient_id" INT NOT NULL REFERENCES "patient" ("id") ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS "questionnairesession" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "genre" VARCHAR(100) NOT NULL,
+    "responses" JSONB NOT NULL,
+    "domain_scores" JSONB NOT NULL,
+    "finished" BOOL NOT NULL,
+    "patient_id" INT NOT NULL REFERENCES "patient" ("id") ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS "aerich" (
+    "id" SERIAL NOT NULL PRIMARY KEY,
+    "version" VARCHAR(255) NOT NULL,
+    "app" VARCHAR(100) NOT NULL,
+    "content" JSONB NOT NULL
+);"""
+
+
+async def downgrade(db: BaseDBAsyncClient) -> str:
+    return """
+        """
+
+
+MODELS_STATE = (
+    "eJztmt1O2zAYhm+lytEmMQQdDDRNk9oCGgPajXbTpGmK3MRNLRI72M4Asd77bCep8+MWMi"
+    "isyGft9xPbj/3Zb9zeOhHxYcg2DxAIMGEcec771q2DQQTFB4N3o+WAONY+aeBgHKpwvxw3"
+    "ZpwCjwvPBIQMCpMPmUdRzBHBwoqTMJRG4olAhANtSjC6TKDLSQD5FFLh+PlLmBH24TVk+d"
+    "f4wp0gGPqlLiNftq3sLr+Jle0Y8yMVKFsbux4Jkwjr4PiGTwmeRyPMpTWAGFLAoXw8p4ns"
+    "vuxdNtZ8RGlPdUjaxUKODycgCXlhuGNX2xzX7Q9G7vBw5LpOA0AewRKu6CpTow9kF960t3"
+    "f2dvbfvtvZFyGqm3PL3ixtWoNJExWe/siZKT/gII1QjDVU0RyHOKmT/Twc9M1oCykVvj7y"
+    "eOtPK0Ssxjmnugx0btCk9ep6AtRLOEoY8skRY5ehNPS/d857nzrnr846P15LDxH1kJZKv3"
+    "c66Co4ol4Cqp6iHtBVU6HRi0Ez2UfWBH4pyeJ/AH6Bh8I6+t4UUDP6eUIFuxjEGuJ2InDt"
+    "hhAHfCq+bm9tLeGf0xZRVdqZq536yoQF/Fg0Chst8FKSXeAPWOAx4Ahi7jY6N8tJd5+fa8"
+    "D9MY5QKUomF8YTNCNWZ3xEKEQBPoE3CvWx6BTAnmkHycTYF/2kNUM8y5dRbtUqiYKruZar"
+    "rC5BQIwb8nTf7Qx7nYNDR6EeA+/iClDfLTGXHtImFcs8tu6K2lHVAjAIFB85ENntXAgTj8"
+    "OEOiaNnLmWC+RCkFXH61Tay9QxJlEThZCFW32wWB/UNtLnKfd8qzWUe2EXXlzuhU3flrst"
+    "d1vuDy93PQ36ssnw5tDNko9OzmEI1DAXCqry7daazcgiTVXS+OI9iZmvEJpw+ppdKmCAKB"
+    "ymj3xJxFZ5khjZGY6VRYwXnzGXxQxWyLAHzks5cOwdlL2DqhN3PkwS7EmYrXGCQo4w25TN"
+    "fnRWu3E+2c2UTyLRtss8QptNTC3RTs6jT84EYcSm0LDddwkJIcDmqSmmVWZlLPJWNR1zy9"
+    "OS7w4GpyXy3eNRhfe3s+6h2K7UNIgglF5z5WeCvaa117T/jUDeWJtr2g6kyJs6Bn2deZYq"
+    "aqBjrIZep7pepqF/Q5q/Gd1XRRdSXqCObu/u3kNHi6iFOlr5yqeULKoGhLPwF0h3JW8p6V"
+    "9qDIfTXf/C4fZX8n+Qu8/6I8TsL7UKsPw="
+)
@@ -6,3 +6,14 @@ def get_question_text(question_id):
         if question['id'] == question_id:
             return question['text']
     return "Question non trouvée."
+
+
+def get_question(question_id):
+    for question in questions:
+        if question['id'] == question_id:
+            return question
+    return None
+
+
+def get_gender_label(gender_id):
+    return "male" if gender_id == 1 else "female" if gender_id == 2 else "other"
@@ -1,14 +1,19 @@
+import asyncio
 from fastapi import APIRouter, status, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import logging as log
 from typing import List, Literal, Optional
-from db_models import *
-from enter_model import *
+from db_models import Patient, Docteur, Diagnostic, QuestionnaireSession
+from enter_model import questions, Question, PatientCreateRequest, DiagnosticData, SessionStartRequest, SessionAnswerRequest
 from tortoise.query_utils import Prefetch
 from tortoise.exceptions import DoesNotExist
-from ds import take_question
-from diago import interview_summup
-from score import *
+from tortoise.transactions import in_transaction
+from ds import take_question, prefetch_question, cached_question, QUESTION_LANGUAGE, PREFETCH_AHEAD
+from diago import interview_summup, speculate_summup, release_summup
+from score import DOMAINS, calculate_total_score, update_domain_scores, completed_domains
+from outils import get_question, get_gender_label
+import startup
 
 router = APIRouter()
 
@@ -36,8 +41,9 @@ async def get_diagnostic_questions():
     question = take_question(questions)
     return question
 
-def get_score(file):
-    return calculate_total_score(file)
+def get_score(file, domain_scores=None):
+    domain_sums = [domain_scores[domain] for domain in DOMAINS] if domain_scores else None
+    return calculate_total_score(file, domain_sums)
 
 @router.post("/recup-diagnostic/", status_code=status.HTTP_200_OK)
 async def create_diagnostic(data: DiagnosticData):
@@ -60,7 +66,7 @@ async def create_diagnostic(data: DiagnosticData):
     # Création du dictionnaire file
     file = {
         "patient_name": data.patient_name,
-        "patient_gender": "male" if data.patient_gender == 1 else "female" if data.patient_gender == 2 else "other",
+        "patient_gender": get_gender_label(data.patient_gender),
         "responses": responses
     }
 
@@ -79,6 +85,140 @@ async def create_diagnostic(data: DiagnosticData):
 
 
 
+# Questionnaire par session : start -> answer (une question à la fois) -> finish
+
+def load_responses(session):
+    # Les clés JSON reviennent de la base sous forme de chaînes
+    return {int(key): value for key, value in session.responses.items()}
+
+def dump_responses(responses):
+    # Clés en chaînes pour le JSON (orjson refuse les clés entières)
+    return {str(key): value for key, value in responses.items()}
+
+def remaining_questions(responses):
+    return [question for question in questions if question['id'] not in responses]
+
+def prefetch_upcoming(upcoming, gender):
+    for question in upcoming[:PREFETCH_AHEAD]:
+        prefetch_question(question['text'], QUESTION_LANGUAGE, gender)
+
+async def serve_question(upcoming, gender):
+    # La question attendue passe avant les suivantes dans la file des reformulations
+    future = prefetch_question(upcoming[0]['text'], QUESTION_LANGUAGE, gender)
+    prefetch_upcoming(upcoming[1:], gender)
+    try:
+        text = await asyncio.wrap_future(future)
+    except Exception as e:
+        # Sans LLM, la question est posée telle quelle
+        log.error(f"Rephrasing failed: {e}")
+        text = upcoming[0]['text']
+    return {**upcoming[0], "text": text}
+
+async def get_open_session(session_id, connection=None):
+    query = QuestionnaireSession.filter(id=session_id)
+    if connection is not None:
+        # Verrou sur la ligne jusqu'à la fin de la transaction
+        query = query.select_for_update().using_db(connection)
+    session = await query.prefetch_related("patient").first()
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if session.finished:
+        raise HTTPException(status_code=409, detail="Session already finished")
+    return session
+
+def session_file(session, responses):
+    return {
+        "patient_name": session.patient.nom,
+        "patient_gender": get_gender_label(int(session.genre)),
+        "responses": responses
+    }
+
+@router.post("/session/start/")
+async def start_session(data: SessionStartRequest):
+    try:
+        patient = await Patient.get(nom=data.patient_name)
+    except DoesNotExist:
+        raise HTTPException(status_code=404, detail="Patient not found")
+
+    first = await serve_question(questions, get_gender_label(data.patient_gender))
+    session = await QuestionnaireSession.create(patient=patient, genre=data.patient_gender)
+    return {"session_id": session.id, "total": len(questions), "question": first}
+
+@router.post("/session/{session_id}/answer/")
+async def answer_session(session_id: int, data: SessionAnswerRequest):
+    question = get_question(data.question_id)
+    if question is None:
+        raise HTTPException(status_code=404, detail="Question not found")
+    if data.response not in question["range"]:
+        raise HTTPException(status_code=400, detail="Response out of range")
+
+    # Deux réponses simultanées sur la même session ne s'écrasent pas
+    async with in_transaction() as connection:
+        session = await get_open_session(session_id, connection)
+        gender = get_gender_label(int(session.genre))
+        # L'enregistrement de la réponse ne dépend jamais du LLM
+        text = data.text or cached_question(question['text'], QUESTION_LANGUAGE, gender) or question['text']
+        responses = load_responses(session)
+        responses[question['id']] = [
+            data.response,
+            min(question["range"].keys()),
+            max(question["range"].keys()),
+            question["range"][data.response],
+            text
+        ]
+        session.responses = dump_responses(responses)
+        session.domain_scores = update_domain_scores(session.domain_scores, responses, question['id'])
+        await session.save(using_db=connection)
+
+    done = completed_domains(responses)
+    if len(done) == len(DOMAINS):
+        # Toutes les réponses sont là : le résumé démarre avant l'appel à finish
+        file = session_file(session, responses)
+        speculate_summup(session.id, get_score(file, session.domain_scores), file)
+
+    upcoming = remaining_questions(responses)
+    return {
+        "session_id": session.id,
+        "answered": len(responses),
+        "domain_scores": session.domain_scores,
+        "completed_domains": done,
+        "question": await serve_question(upcoming, gender) if upcoming else None
+    }
+
+@router.post("/session/{session_id}/finish/", status_code=status.HTTP_200_OK)
+async def finish_session(session_id: int):
+    session = await get_open_session(session_id)
+    responses = load_responses(session)
+    if len(completed_domains(responses)) < len(DOMAINS):
+        raise HTTPException(status_code=400, detail="Questionnaire incomplete")
+
+    # Résumé lancé à la dernière réponse : en général déjà prêt ou presque
+    file = session_file(session, responses)
+    try:
+        res = await asyncio.wrap_future(speculate_summup(session.id, get_score(file, session.domain_scores), file))
+    except Exception as e:
+        # La session reste ouverte : un nouvel appel à finish relance le résumé
+        log.error(f"Summary failed for session {session.id}: {e}")
+        raise HTTPException(status_code=502, detail="Summary generation failed")
+
+    # Clôture atomique : un second appel concurrent reçoit 409
+    async with in_transaction() as connection:
+        session = await get_open_session(session_id, connection)
+        await Diagnostic.create(
+            contenu={"responses": res},
+            questions=questions,
+            patient=session.patient,
+            genre=session.genre,
+            responses=dump_responses(responses),
+            using_db=connection
+        )
+        session.finished = True
+        await session.save(using_db=connection, update_fields=["finished"])
+    release_summup(session.id)
+
+    return {"message": "Diagnostic recorded successfully"}
+
+
 class DiagnosticResponse(BaseModel):
     patient_name: str
     patient_gender: int
@@ -113,3 +253,25 @@ async def get_diagnostics():
 async def read_data(n: int = 10):
     """ok"""
     return {"ok": "ok"}
+
+
+# Vivant : le process répond
+@router.get("/health/live")
+async def health_live():
+    return {"status": "alive"}
+
+
+# Prêt : schéma vérifié et caches préchargés
+@router.get("/health/ready")
+async def health_ready():
+    state = startup.state
+    if state["warm"]:
+        status_label = "warm"
+    elif state["warmup_error"]:
+        status_label = "warmup_failed"
+    else:
+        status_label = "warming"
+    return JSONResponse(
+        status_code=200 if state["warm"] else 503,
+        content={"status": status_label, **state},
+    )
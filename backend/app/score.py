@@ -1,14 +1,55 @@
 
+# Questions (ids) composant chaque domaine du KCCQ-12, dans l'ordre de sum_domain_scores
+DOMAINS = {
+    'physical_limitations': [1, 2, 3],
+    'symptom_frequency': [5, 6],
+    'symptom_burden': [4, 7],
+    'quality_of_life': [8, 9],
+    'social_limitations': [10, 11, 12],
+}
+
 
 def sum_domain_scores(response_dict):
 
-    sum_physical_limitations = sum([int(response_dict[i][0]) for i in [1, 2, 3]])
-    sum_symptom_frequency = sum([int(response_dict[i][0]) for i in [5, 6]])
-    sum_symptom_burden = sum([int(response_dict[i][0]) for i in [4, 7]])
-    sum_quality_of_life = sum([int(response_dict[i][0]) for i in [8, 9]])
-    sum_social_limitations = sum([int(response_dict[i][0]) for i in [10, 11, 12]])
+    return [sum([int(response_dict[i][0]) for i in ids]) for ids in DOMAINS.values()]
+
+
+def get_question_domain(question_id):
+    for domain, ids in DOMAINS.items():
+        if question_id in ids:
+            return domain
+    return None
+
+
+def update_domain_scores(domain_scores, response_dict, question_id):
+    """
+    Update the running sum of the domain containing question_id.
+
+    Parameters:
+    domain_scores (dict): Running sums per domain, updated in place.
+    response_dict (dict): Responses received so far, keyed by question id.
+    question_id (int): The question that has just been answered.
+
+    Returns:
+    dict: The updated domain_scores.
+    """
+    domain = get_question_domain(question_id)
+    if domain is not None:
+        domain_scores[domain] = sum([int(response_dict[i][0]) for i in DOMAINS[domain] if i in response_dict])
+    return domain_scores
+
+
+def completed_domains(response_dict):
+    """
+    List the domains for which every item has been answered.
 
-    return [sum_physical_limitations, sum_symptom_frequency, sum_symptom_burden, sum_quality_of_life, sum_social_limitations]
+    Parameters:
+    response_dict (dict): Responses received so far, keyed by question id.
+
+    Returns:
+    list: Names of the completed domains.
+    """
+    return [domain for domain, ids in DOMAINS.items() if all(i in response_dict for i in ids)]
 
 
 def calculate_transformed_score(sum_of_items, min_possible_sum, max_possible_sum):
@@ -31,7 +72,7 @@ def calculate_transformed_score(sum_of_items, min_possible_sum, max_possible_sum
     return transformed_score
 
 
-def calculate_total_score(patient_dict):
+def calculate_total_score(patient_dict, domain_sums=None):
     """
     Calculate the total score across all domains.
 
@@ -41,11 +82,12 @@ def calculate_total_score(patient_dict):
     symptom_burden_sum (int): Sum of scores for Symptom Burden items.
     quality_of_life_sum (int): Sum of scores for Quality of Life items.
     social_limitations_sum (int): Sum of scores for Social Limitations items.
+    domain_sums (list, optional): Sums already computed incrementally, in the order of sum_domain_scores.
 
     Returns:
     dict: patient name and overall summary score
     """
-    physical_limitations_sum, symptom_frequency_sum, symptom_burden_sum, quality_of_life_sum, social_limitations_sum = sum_domain_scores(patient_dict["responses"])
+    physical_limitations_sum, symptom_frequency_sum, symptom_burden_sum, quality_of_life_sum, social_limitations_sum = domain_sums or sum_domain_scores(patient_dict["responses"])
     min_max_values = {
         'physical_limitations': (3, 18),
         'symptom_frequency': (2, 14),
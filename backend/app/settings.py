@@ -0,0 +1,13 @@
+import os
+
+# Configuration Tortoise, aussi chargée par Aerich (voir pyproject.toml) :
+# ce module ne doit importer ni les routes ni les clients LLM
+TORTOISE_ORM = {
+    "connections": {"default": os.environ.get('DATABASE_URL')},
+    "apps": {
+        "models": {
+            "models": ["db_models", "aerich.models"],
+            "default_connection": "default",
+        },
+    },
+}
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+from tortoise import Tortoise
+from tortoise.exceptions import OperationalError
+from enter_model import questions
+from llm import get_client
+from ds import prefetch_question, QUESTION_LANGUAGE, PREFETCH_AHEAD
+from outils import get_gender_label
+
+# Logger d'uvicorn : affiché au niveau INFO, contrairement au logger racine
+log = logging.getLogger("uvicorn.error")
+
+# "check" : vérifie que la dernière migration est appliquée ; "generate" : ancien comportement
+SCHEMA_MODE = os.environ.get('SCHEMA_MODE', 'check')
+MIGRATIONS_DIR = Path(os.environ.get('MIGRATIONS_DIR', Path(__file__).parent / 'migrations' / 'models'))
+WARMUP = os.environ.get('WARMUP', '0') == '1'
+
+# "alive" dès que le process répond, "warm" une fois le schéma vérifié et le warmup terminé
+state = {
+    "alive": True,
+    "warm": False,
+    "startup_seconds": None,
+    "warmup_seconds": None,
+    "warmup_error": None,
+}
+_warmup_tasks = set()
+
+
+def latest_migration():
+    if not MIGRATIONS_DIR.is_dir():
+        return None
+    # Les fichiers Aerich sont préfixés par leur numéro : 0_xxx_init.py, 1_xxx_update.py...
+    files = [path.name for path in MIGRATIONS_DIR.glob('*.py') if path.name.split('_', 1)[0].isdigit()]
+    return max(files, key=lambda name: int(name.split('_', 1)[0]), default=None)
+
+
+async def applied_migration():
+    from aerich.models import Aerich
+
+    try:
+        last = await Aerich.filter(app="models").order_by("-id").first()
+    except OperationalError:
+        # Table aerich absente : aucune migration appliquée
+        return None
+    return last.version if last else None
+
+
+async def check_schema():
+    if SCHEMA_MODE == "generate":
+        await Tortoise.generate_schemas(safe=True)
+        return
+
+    expected = latest_migration()
+    if expected is None:
+        raise RuntimeError(f"No migrations found in {MIGRATIONS_DIR}: set SCHEMA_MODE=generate or run `aerich init-db`")
+
+    applied = await applied_migration()
+    if applied != expected:
+        raise RuntimeError(f"Database schema is at {applied}, expected {expected}: run `aerich upgrade`")
+
+
+async def warmup():
+    started = time.perf_counter()
+    try:
+        # Création du client (import d'openai compris) hors de la boucle : /health/live reste disponible
+        await asyncio.to_thread(get_client)
+        # Reformulation des premières questions servies par /session/start/
+        futures = [
+            prefetch_question(question['text'], QUESTION_LANGUAGE, get_gender_label(gender_id))
+            for gender_id in (1, 2, 3)
+            for question in questions[:PREFETCH_AHEAD + 1]
+        ]
+        await asyncio.gather(*[asyncio.wrap_future(future) for future in futures])
+    except Exception as e:
+        # Reste "non prêt" : un pod sans accès au LLM ne doit pas recevoir de trafic
+        state["warmup_error"] = str(e)
+        log.error(f"Warmup failed: {e}")
+        return
+    finally:
+        state["warmup_seconds"] = time.perf_counter() - started
+    state["warm"] = True
+    log.info(f"Warmup done in {state['warmup_seconds']:.3f}s")
+
+
+async def on_startup(boot_time):
+    await check_schema()
+    state["startup_seconds"] = time.perf_counter() - boot_time
+    log.info(f"Startup done in {state['startup_seconds']:.3f}s")
+    if WARMUP:
+        # Référence gardée pour que la tâche ne soit pas collectée en cours de route
+        task = asyncio.create_task(warmup())
+        _warmup_tasks.add(task)
+        task.add_done_callback(_warmup_tasks.discard)
+    else:
+        state["warm"] = True
@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
 import requests
-import json
 import logging
 import doctor
 
@@ -38,122 +37,97 @@ def post_consultation_page():
     st.header("Explications de prise de traitement")
     st.write("Prenez le médicament avec un verre d'eau.")
 
-def load_questions(file_path):
-    with open(file_path, 'r') as file:
-        return [line.strip() for line in file.readlines()]
+API_URL = "http://backend:8000"
 
-def save_responses(file_path, responses):
-    with open(file_path, 'w') as file:
-        json.dump(responses, file, indent=4)
-
-@st.cache_data
-def fetch_questions():
+def call_session_api(path, payload=None):
     try:
-        response = requests.get("http://backend:8000/diagnostic")
+        response = requests.post(f"{API_URL}/session/{path}", json=payload)
         response.raise_for_status()  # Vérifie les erreurs HTTP
-        questions = response.json()
-        return questions
+        return response.json()
     except requests.exceptions.RequestException as e:
-        st.error(f"Erreur lors de la récupération des questions: {e}")
-        return []
-    except ValueError as e:
-        st.error(f"Erreur de décodage JSON: {e}")
-        st.write("Réponse brute de l'API:")
-        st.write(response.text)  # Affiche la réponse brute pour le débogage
-        return []
+        st.error(f"Erreur lors de l'appel au questionnaire: {e}")
+        logging.error(f"Erreur API session/{path}: {e}")
+        return None
 
 def chatbot_page():
     st.title("📋 Questionnaire Médical")
     st.caption("Répondez aux questions suivantes pour aider votre médecin à mieux comprendre votre situation.")
 
-    questions = fetch_questions()
-   # logging.info(f"Questions récupérées: {questions}")
-#     questions = [
-#     {"id": 1, "text": "Avez-vous des douleurs thoraciques ?", "response_type": "boolean"},
-#     {"id": 2, "text": "Sur une échelle de 1 à 5, comment évalueriez-vous votre niveau de douleur ?", "response_type": "scale", "range": {1: "Pas du tout", 2: "Un peu", 3: "Modéré", 4: "Beaucoup", 5: "Énormément"}},
-#     {"id": 3, "text": "À quel point êtes-vous satisfait de votre traitement actuel ?", "response_type": "scale", "range": {1: "Pas satisfait", 2: "Peu satisfait", 3: "Neutre", 4: "Satisfait", 5: "Très satisfait"}}
-# ]
-
-    if "current_question_index" not in st.session_state:
-        st.session_state.current_question_index = 0
-
-    if "responses" not in st.session_state:
-        st.session_state.responses = []
+    # Les réponses sont envoyées au backend une par une (session côté serveur)
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = None
+        st.session_state.current_question = None
+        st.session_state.total_questions = 0
+        st.session_state.history = []
+        st.session_state.finished = False
 
     patient_name = st.text_input("Nom du patient", key="patient_name")
     patient_gender = st.selectbox("Genre du patient", ["","Homme", "Femme", "Autre"], key="patient_gender")
     patient_gender_id = 1 if patient_gender == "Homme" else 2 if patient_gender == "Femme" else 3 if patient_gender == "Autre" else None
+
+    # Démarrage de la session
+    if st.session_state.session_id is None:
+        if patient_name == "":
+            st.warning("Veuillez entrer un nom pour continuer.")
+        elif patient_gender == "":
+            st.warning("Veuillez sélectionner un genre pour continuer.")
+        elif st.button("Commencer"):
+            data = call_session_api("start/", {"patient_name": patient_name, "patient_gender": patient_gender_id})
+            if data is not None:
+                st.session_state.session_id = data["session_id"]
+                st.session_state.total_questions = data["total"]
+                st.session_state.current_question = data["question"]
+                st.rerun()
+        return
+
     # Afficher l'historique des réponses
-    for i, (question, response) in enumerate(zip(questions, st.session_state.responses)):
-        st.write(f"**Question {i+1}**: {question['text']}")
+    for i, (question_text, response) in enumerate(st.session_state.history):
+        st.write(f"**Question {i+1}**: {question_text}")
         st.write(f"**Réponse**: {response}")
 
     # Poser la question actuelle
-    if st.session_state.current_question_index < len(questions):
-        current_question = questions[st.session_state.current_question_index]
-        st.write(f"**Question {st.session_state.current_question_index + 1}**: {current_question['text']}")
-        response_key = f"question_{st.session_state.current_question_index}"
-        if current_question["response_type"] == "boolean":
-            user_response = st.radio("Votre réponse", ["Oui", "Non"], key=response_key)
-            response = 0 if user_response == "Non" else 1
-        elif current_question["response_type"] == "scale":
-            # Affichage de l'échelle avec labels
-            range_values = list(current_question["range"].keys())
-            response = st.select_slider("Votre réponse", options=range_values,
-                                        format_func=lambda x: current_question["range"][x], key=response_key)
+    current_question = st.session_state.current_question
+    if current_question is not None:
+        index = len(st.session_state.history)
+        st.write(f"**Question {index + 1}/{st.session_state.total_questions}**: {current_question['text']}")
+        response_key = f"question_{current_question['id']}"
+        # Affichage de l'échelle avec labels (les clés JSON arrivent en chaînes)
+        question_range = {int(key): label for key, label in current_question["range"].items()}
+        response = st.select_slider("Votre réponse", options=list(question_range.keys()),
+                                    format_func=lambda x: question_range[x], key=response_key)
 
         if st.button("Continuer"):
-            if response is not None:
-                st.session_state.responses.append(response)
-                st.session_state.current_question_index += 1
-                st.query_params = {"page": "questionnaire", "index": st.session_state.current_question_index}
+            data = call_session_api(f"{st.session_state.session_id}/answer/",
+                                    {"question_id": current_question["id"], "response": response,
+                                     "text": current_question["text"]})
+            if data is not None:
+                st.session_state.history.append((current_question["text"], question_range[response]))
+                st.session_state.current_question = data["question"]
+                st.query_params = {"page": "questionnaire", "index": index + 1}
                 st.rerun()
 
-    # Cas 2 : Toutes les questions ont été répondues
-    else:
-        # Vérifier que les informations patient sont bien renseignées
-        if patient_name == "":
-            st.warning("Veuillez entrer un nom pour continuer.")
-        elif patient_gender == "":
-            st.warning("Veuillez sélectionner un genre pour continuer.")
+    # Toutes les questions ont été répondues : le résumé est déjà en préparation côté serveur
+    elif not st.session_state.finished:
+        with st.spinner("Transmission de vos réponses au médecin..."):
+            try:
+                response_api = requests.post(f"{API_URL}/session/{st.session_state.session_id}/finish/")
+            except requests.exceptions.RequestException as e:
+                response_api = None
+                st.error(f"Erreur lors de l'envoi du questionnaire: {e}")
+        # 409 : session déjà terminée, la réponse précédente a été perdue en route
+        if response_api is not None and response_api.status_code in (200, 409):
+            st.session_state.finished = True
+            logging.info("Diagnostic enregistré avec succès.")
         else:
-            # Construction de la structure des réponses
-            # Ici, pour chaque question, si elle possède un "range", on récupère les valeurs min, max et le label associé
-            structured_responses = {
-                "patient_name": patient_name,
-                "patient_gender": patient_gender_id,
-                "responses": {
-                    question["id"]: [
-                        response,
-                        min(question["range"].keys()) if "range" in question else None,
-                        max(question["range"].keys()) if "range" in question else None,
-                        question["range"].get(response) if "range" in question else None,
-                        question["text"]
-                    ]
-                    for question, response in zip(questions, st.session_state.responses)
-                }
-            }
-            save_responses('responses.json', structured_responses)
-            st.write("Merci d'avoir répondu à toutes les questions. Vos réponses ont été transférées à un médecin.")
-
-            # Envoi des données vers le backend
-            with open('responses.json', 'r') as file:
-                data = json.load(file)
-            for key, value_list in data["responses"].items():
-                # On remplace None par "-1" si besoin, puis on jointe les éléments avec une virgule
-                data["responses"][key] = ", ".join(
-                    [str(item) if item is not None else "-1" for item in value_list]
-                )
-
-            logging.info(f"Données envoyées à l'API: {data}")
-            url = "http://backend:8000/recup-diagnostic/"
-            response_api = requests.post(url, json=data)
-            # Vérifier la réponse de l'API
-            if response_api.status_code == 200:
-                logging.info("Diagnostic enregistré avec succès.")
-            else:
+            if response_api is not None:
                 logging.error(f"Erreur lors de l'enregistrement du diagnostic: {response_api.status_code}")
                 logging.error(f"Réponse de l'API: {response_api.text}")
+                st.error("Vos réponses n'ont pas pu être transmises au médecin.")
+            if st.button("Réessayer"):
+                st.rerun()
+
+    if st.session_state.finished:
+        st.write("Merci d'avoir répondu à toutes les questions. Vos réponses ont été transférées à un médecin.")
 
 def generate_pdf():
     # Fonction pour générer un PDF (exemple basique)